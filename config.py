@@ -1,4 +1,6 @@
 import os
+import sys
+import functools
 from dotenv import load_dotenv
 import discord # Import discord for Color object
 import logging # Import logging
@@ -8,30 +10,46 @@ logger = logging.getLogger(__name__)
 
 load_dotenv() # Load variables from .env file
 
+# Snapshot the environment once (after .env is loaded) so settings are read from a plain dict
+ENV = dict(os.environ)
+
+def _get(key: str, default=None):
+    """Reads a setting from the environment snapshot."""
+    return ENV.get(key, default)
+
 # --- Core Settings ---
-DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
-DISCORD_CHANNEL_ID = int(os.getenv("DISCORD_CHANNEL_ID")) if os.getenv("DISCORD_CHANNEL_ID") else None
-HEARTBEAT_INTERVAL_MINUTES = int(os.getenv("HEARTBEAT_INTERVAL_MINUTES", 10))
-SCRAPE_INTERVAL_SECONDS = int(os.getenv("SCRAPE_INTERVAL_SECONDS", 60))
+DISCORD_BOT_TOKEN = _get("DISCORD_BOT_TOKEN")
+DISCORD_CHANNEL_ID = int(_get("DISCORD_CHANNEL_ID")) if _get("DISCORD_CHANNEL_ID") else None
+HEARTBEAT_INTERVAL_MINUTES = int(_get("HEARTBEAT_INTERVAL_MINUTES", 10))
+SCRAPE_INTERVAL_SECONDS = int(_get("SCRAPE_INTERVAL_SECONDS", 60))
+MAX_CONCURRENT_SCRAPES = max(1, int(_get("MAX_CONCURRENT_SCRAPES", 10))) # Max sources fetched/parsed at once
 
 # --- DeepL Settings ---
-DEEPL_API_KEY = os.getenv("DEEPL_API_KEY")
+DEEPL_API_KEY = _get("DEEPL_API_KEY")
+DEEPL_MAX_WORKERS = int(_get("DEEPL_MAX_WORKERS", 4)) # Max concurrent DeepL requests (dedicated thread pool)
+DEEPL_BATCH_SIZE = min(50, max(1, int(_get("DEEPL_BATCH_SIZE", 50)))) # Texts per DeepL request (API max is 50)
 # DEEPL_GLOSSARY_ID REMOVED
 
 # --- Ollama Settings ---
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+OLLAMA_MODEL = _get("OLLAMA_MODEL", "llama3")
+OLLAMA_HOST = _get("OLLAMA_HOST") # None = ollama default (http://localhost:11434)
+OLLAMA_BATCH_SIZE = max(1, int(_get("OLLAMA_BATCH_SIZE", 8))) # Headlines evaluated per Ollama prompt
 
 # --- Behaviour Settings ---
-raw_keywords = os.getenv("USER_KEYWORDS", "")
-USER_KEYWORDS = set(k.strip().lower() for k in raw_keywords.split(',') if k.strip())
+raw_keywords = _get("USER_KEYWORDS", "")
+USER_KEYWORDS = frozenset(filter(None, (k.strip().lower() for k in raw_keywords.split(','))))
 FUZZY_MATCH_THRESHOLD = 88
+LLM_CACHE_SIZE = int(_get("LLM_CACHE_SIZE", 4096)) # Max cached Ollama evaluations / DeepL translations (each)
+EVALUATION_TTL_SECONDS = int(_get("EVALUATION_TTL_SECONDS", 6 * 60 * 60)) # Cached evaluations expire after this (news significance goes stale)
 SENTIMENT_POSITIVE_THRESHOLD = 0.1
 SENTIMENT_NEGATIVE_THRESHOLD = -0.1
+SEEN_DB_PATH = _get("SEEN_DB_PATH", "seen.db") # SQLite file keeping seen headlines across restarts
+SEEN_DB_RETENTION_DAYS = int(_get("SEEN_DB_RETENTION_DAYS", 7)) # Seen headlines older than this are forgotten
 
-# **NEW**: Define terms/patterns to keep untranslated (case-insensitive matching)
-# Use lowercase for easier matching. Order longer terms before shorter ones if they overlap (e.g., 'Dow Jones' before 'Dow')
-# Regex patterns can be used too, but start simple.
-NO_TRANSLATE_TERMS = sorted([
+# **NEW**: Define terms to keep untranslated (case-insensitive matching)
+# Use lowercase for easier matching. Order doesn't matter: the matcher in llm_handler always prefers the longest
+# overlapping term (e.g., 'Dow Jones' over 'Dow').
+NO_TRANSLATE_TERMS = frozenset([
     # Acronyms & Symbols
     "fomc", "fed", "ecb", "boj", "boe", "opec", "sec", "esma",
     "cpi", "nfp", "gdp", "pmi", "ism",
@@ -45,19 +63,28 @@ NO_TRANSLATE_TERMS = sorted([
     "federal reserve", "european central bank",
     # Financial Jargon (add cautiously - might interfere with translation)
     # "quantitative easing", "bull market", "bear market" # Example: Maybe translate these? Decide case-by-case.
-], key=len, reverse=True) # Sort by length descending to match longer terms first
+])
 
+# Category -> name of a discord.Color factory; colors are built on first use by category_color()
 CATEGORIES = {
-    "Stocks": discord.Color.blue(),
-    "Economy": discord.Color.gold(),
-    "Forex": discord.Color.purple(),
-    "Crypto": discord.Color.orange(),
-    "Geopolitics": discord.Color.red(),
-    "Commodities": discord.Color.dark_green(),
-    "General": discord.Color.light_grey(),
-    "Unknown": discord.Color.dark_grey()
+    "Stocks": "blue",
+    "Economy": "gold",
+    "Forex": "purple",
+    "Crypto": "orange",
+    "Geopolitics": "red",
+    "Commodities": "dark_green",
+    "General": "light_grey",
+    "Unknown": "dark_grey"
 }
-DEFAULT_CATEGORY_COLOR = discord.Color.blurple()
+CATEGORIES = {sys.intern(name): color for name, color in CATEGORIES.items()} # Interned keys: lookups of interned names compare by identity
+CATEGORY_LOOKUP = {name.lower(): name for name in CATEGORIES} # Case-insensitive name -> canonical category name
+CATEGORY_SET = frozenset(CATEGORIES) # For plain membership checks
+DEFAULT_CATEGORY_COLOR = "blurple"
+
+@functools.cache
+def category_color(category: str) -> discord.Color:
+    """Returns the embed color for a category (DEFAULT_CATEGORY_COLOR for unknown ones), built once per category."""
+    return getattr(discord.Color, CATEGORIES.get(category, DEFAULT_CATEGORY_COLOR))()
 
 # --- News Sources Configuration ---
 NEWS_SOURCES = {
@@ -5,7 +5,17 @@ import asyncio
 import deepl
 from deepl import DeepLException
 import json
+try:
+    import orjson # Fast JSON parsing for Ollama responses (optional)
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads # orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
 import re # Import regex for placeholder logic
+import ahocorasick # Multi-pattern matching for no-translate terms
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from hashlib import blake2b
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +23,7 @@ logger = logging.getLogger(__name__)
 deepl_translator = None
 if config.DEEPL_API_KEY:
     try:
-        deepl_translator = deepl.Translator(config.DEEPL_API_KEY)
+        deepl_translator = deepl.Translator(config.DEEPL_API_KEY) # Keeps one pooled requests.Session for its lifetime
         logger.info("DeepL Translator initialized.")
     except Exception as e:
         logger.error(f"Failed to initialize DeepL Translator: {e}", exc_info=True)
@@ -21,23 +31,109 @@ if config.DEEPL_API_KEY:
 else:
     logger.warning("DEEPL_API_KEY not found. DeepL Translation disabled.")
 
-# --- Ollama Significance & Category Evaluation Function ---
-async def evaluate_significance_and_category(text: str) -> dict | None:
+# Dedicated pool for the blocking DeepL client, so translations can't starve the loop's default executor
+deepl_executor = ThreadPoolExecutor(max_workers=config.DEEPL_MAX_WORKERS, thread_name_prefix="deepl")
+
+# --- Ollama Clients (shared so the HTTP connection pool is reused across evaluations) ---
+OLLAMA_TIMEOUT_SECONDS = 60 # Sized for one ~100-token reply
+ollama_client = ollama.AsyncClient(host=config.OLLAMA_HOST, timeout=OLLAMA_TIMEOUT_SECONDS)
+# Batch replies are up to 100 tokens per headline, so their timeout scales with the batch size
+ollama_batch_client = ollama.AsyncClient(host=config.OLLAMA_HOST, timeout=OLLAMA_TIMEOUT_SECONDS * config.OLLAMA_BATCH_SIZE)
+
+# Outermost {...} in an Ollama reply (DOTALL: objects span lines)
+JSON_OBJECT_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+
+# Phrases the evaluation prompt always ignores (routine summaries, analyst ratings, educational/commentary pieces).
+# Headlines matching these are rejected locally without an Ollama call.
+IGNORE_PATTERN = re.compile(r'\b(analysts? (up|down)grades?|analyst ratings?|market today|edge[sd]? (lower|higher)|hovers around|what is|understanding the|top \d+ stocks|discusses future)\b', re.IGNORECASE)
+
+# --- No-Translate Automaton (built once at import) ---
+# Aho-Corasick finds every term occurrence in one scan of the headline, however many terms are configured.
+# Payload is (term length, needs word boundaries); terms with non-word chars (like EUR/USD) skip the boundary check.
+no_translate_automaton = None
+if config.NO_TRANSLATE_TERMS:
+    no_translate_automaton = ahocorasick.Automaton()
+    for term in config.NO_TRANSLATE_TERMS:
+        key = term.lower()
+        no_translate_automaton.add_word(key, (len(key), not re.search(r'\W', term)))
+    no_translate_automaton.make_automaton()
+
+def _is_word_char(char: str) -> bool:
+    """Matches the regex definition of \\w."""
+    return char.isalnum() or char == '_'
+
+def find_no_translate_spans(text: str) -> list[tuple[int, int]]:
     """
-    Uses Ollama to evaluate headline significance AND determine its category.
-    Outputs JSON: {"significant": bool, "category": str, "reason": str}
+    Returns non-overlapping (start, end) spans of NO_TRANSLATE_TERMS in text,
+    case-insensitive, preferring the leftmost and then the longest match.
     """
-    if not text:
-        logger.warning("Received empty text for evaluation.")
+    if not no_translate_automaton or not text:
+        return []
+    lowered = text.lower()
+    if len(lowered) != len(text): # Rare: some characters expand when lowercased (e.g. 'İ'), keep offsets aligned
+        lowered = ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+    candidates = []
+    for end_index, (length, word_boundaries) in no_translate_automaton.iter(lowered):
+        start, end = end_index - length + 1, end_index + 1
+        if word_boundaries and ((start > 0 and _is_word_char(text[start - 1])) or (end < len(text) and _is_word_char(text[end]))):
+            continue # Part of a longer word (e.g. 'sol' in 'solar')
+        candidates.append((start, end))
+
+    # Greedy sweep: leftmost first, longest first at the same start
+    spans = []
+    last_end = 0
+    for start, end in sorted(candidates, key=lambda span: (span[0], -span[1])):
+        if start >= last_end:
+            spans.append((start, end))
+            last_end = end
+    return spans
+
+# Finds the placeholders inserted by translate_en_to_el so they can be reverted in a single pass.
+# DeepL sometimes re-cases them (__Placeholder_0__) or adds spaces, so match loosely and key on the number.
+PLACEHOLDER_PATTERN = re.compile(r'__\s*placeholder\s*_\s*(\d+)\s*__', re.IGNORECASE)
+# Text with no letters left (whitespace, digits, punctuation only)
+UNTRANSLATABLE_PATTERN = re.compile(r'[\W\d_]*')
+
+# --- Result Caches ---
+# The same headline often shows up on several sources; evaluate/translate it once.
+# Keyed by a hash of the whitespace/case-normalized headline, bounded LRU of (time stored, value).
+# Failures (None) are not cached; evaluations expire after config.EVALUATION_TTL_SECONDS.
+evaluation_cache = OrderedDict()
+translation_cache = OrderedDict()
+
+def _cache_key(text: str) -> bytes:
+    """Hash of the normalized headline, used as the cache key."""
+    return blake2b(' '.join(text.split()).lower().encode('utf-8'), digest_size=16).digest()
+
+def _cache_get(cache: OrderedDict, key: bytes, ttl_seconds: float | None = None):
+    """Returns the cached value (marking it recently used) or None. Entries older than ttl_seconds are dropped."""
+    entry = cache.get(key)
+    if entry is None:
         return None
-
-    # --- Enhanced Prompt V5 (Focus on Ignoring & More Examples) ---
-    prompt = f"""
+    stored_at, value = entry
+    if ttl_seconds is not None and time.monotonic() - stored_at > ttl_seconds:
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return value
+
+def _cache_put(cache: OrderedDict, key: bytes, value):
+    """Stores a value (with the time stored), evicting the least recently used entry when full."""
+    cache[key] = (time.monotonic(), value)
+    cache.move_to_end(key)
+    if len(cache) > config.LLM_CACHE_SIZE:
+        cache.popitem(last=False)
+
+# --- Evaluation Prompt (Enhanced Prompt V5: Focus on Ignoring & More Examples) ---
+# Built once at import; the headline is concatenated between prefix and suffix per call.
+_PROMPT_PREFIX = """
     **TASK:** Analyze the financial news headline below. Determine if it is significant market news based ONLY on the provided criteria. Output a JSON object containing your decision, the primary category, and a brief reason.
 
-    **HEADLINE:** "{text}"
+    **HEADLINE:** \""""
 
-    **CRITERIA FOR SIGNIFICANCE (Set "significant": true ONLY if headline CLEARLY meets one or more criteria below):**
+# Criteria and categories, shared by the single-headline and batch prompts
+_PROMPT_CRITERIA = """**CRITERIA FOR SIGNIFICANCE (Set "significant": true ONLY if headline CLEARLY meets one or more criteria below):**
     *   **IMPACT:** News highly likely to cause **noticeable (>1-2% for major assets)** short-term movement or change sentiment in broad markets (US stocks, major indices), specific sectors (Tech, Energy), major currencies (EUR/USD, USD/JPY), major cryptos (BTC, ETH > +/- 5%), or key commodities (Oil, Gold).
     *   **SOURCE:** **Direct, official policy announcements** (Fed/FOMC rate decisions/statements, ECB/BOJ policy shifts, White House statements on major economy/trade actions, OPEC decisions, major international summit outcomes like G7/G20 agreements).
     *   **DATA RELEASES:** **Key, market-moving** economic indicators (**CPI, NFP/Jobs Report, Core PCE, GDP growth/revision, ISM PMI** - especially if significantly deviating from consensus expectations).
@@ -58,112 +154,156 @@ async def evaluate_significance_and_category(text: str) -> dict | None:
     **CATEGORIES (Choose ONE primary category):**
     "Stocks", "Economy", "Forex", "Crypto", "Geopolitics", "Commodities", "General"
 
-    **OUTPUT FORMAT:**
+    """
+
+_PROMPT_SUFFIX = '"\n\n    ' + _PROMPT_CRITERIA + """**OUTPUT FORMAT:**
     CRITICAL: Output *ONLY* a single, valid JSON object adhering precisely to the format below. Do NOT include ANY introductory text, explanations, apologies, markdown formatting, or anything else before or after the JSON object. Your entire response MUST be the JSON object itself.
     ```json
-    {{
+    {
       "significant": boolean,
       "category": "ChosenCategoryString",
       "reason": "Brief justification (2-5 words)"
-    }}
+    }
     ```
 
     **EXAMPLES (Pay close attention to the 'significant: false' examples):**
     *   Headline: "Fed holds rates steady, signals potential cuts later this year."
         ```json
-        {{
+        {
           "significant": true,
           "category": "Economy",
           "reason": "FOMC rate decision/outlook"
-        }}
+        }
         ```
     *   Headline: "Apple shares fall 5% after reporting weaker iPhone sales."
         ```json
-        {{
+        {
           "significant": true,
           "category": "Stocks",
           "reason": "AAPL earnings miss"
-        }}
+        }
         ```
     *   Headline: "US Job Growth Slows Sharply in April, Unemployment Rate Ticks Up"
         ```json
-        {{
+        {
           "significant": true,
           "category": "Economy",
           "reason": "NFP/Jobs data miss"
-        }}
+        }
         ```
     *   Headline: "Oil prices jump 3% after OPEC+ announces surprise production cut"
         ```json
-        {{
+        {
           "significant": true,
           "category": "Commodities",
           "reason": "OPEC+ production cut"
-        }}
+        }
         ```
     *   **IGNORE EXAMPLE 1:** Headline: "Stock Market Today: Dow Closes Slightly Lower Ahead of Fed Meeting"
         ```json
-        {{
+        {
           "significant": false,
           "category": "Stocks",
           "reason": "Routine market summary"
-        }}
+        }
         ```
     *   **IGNORE EXAMPLE 2:** Headline: "Analyst upgrades MicroTech Inc. (MCTK) to 'Outperform'"
         ```json
-        {{
+        {
           "significant": false,
           "category": "Stocks",
           "reason": "Minor analyst rating"
-        }}
+        }
         ```
     *   **IGNORE EXAMPLE 3:** Headline: "CEO of MidCap Corp Discusses Future Strategy in Interview"
         ```json
-        {{
+        {
           "significant": false,
           "category": "Stocks",
           "reason": "Interview/Commentary"
-        }}
+        }
         ```
     *   **IGNORE EXAMPLE 4:** Headline: "Bitcoin Hovers Around $65,000 as Traders Await Next Catalyst"
         ```json
-        {{
+        {
           "significant": false,
           "category": "Crypto",
           "reason": "Standard price movement"
-        }}
+        }
         ```
     *   **IGNORE EXAMPLE 5:** Headline: "Understanding the Impact of Interest Rates on Bonds"
         ```json
-        {{
+        {
           "significant": false,
           "category": "General",
           "reason": "Educational content"
-        }}
+        }
         ```
     *   **IGNORE EXAMPLE 6:** Headline: "European Leaders Meet to Discuss Regional Cooperation"
         ```json
-        {{
+        {
           "significant": false,
           "category": "Geopolitics",
           "reason": "Routine meeting/Vague"
-        }}
+        }
         ```
 
     **FINAL JSON OUTPUT (ONLY the JSON object):**""" # End of prompt string
 
+# Batch variant: the numbered headlines go between prefix and suffix, the reply is one {"results": [...]} object
+_BATCH_PROMPT_PREFIX = """
+    **TASK:** Analyze EACH of the numbered financial news headlines below. For each one, determine if it is significant market news based ONLY on the provided criteria. Output a JSON object containing, for every headline, your decision, the primary category, and a brief reason.
+
+    **HEADLINES:**
+"""
+
+_BATCH_PROMPT_SUFFIX = "\n\n    " + _PROMPT_CRITERIA + """**OUTPUT FORMAT:**
+    CRITICAL: Output *ONLY* a single, valid JSON object adhering precisely to the format below, with exactly one entry per headline and the headline's number as "id". Do NOT include ANY introductory text, explanations, apologies, markdown formatting, or anything else before or after the JSON object. Your entire response MUST be the JSON object itself.
+    ```json
+    {
+      "results": [
+        {"id": 1, "significant": boolean, "category": "ChosenCategoryString", "reason": "Brief justification (2-5 words)"}
+      ]
+    }
+    ```
+
+    **EXAMPLE:**
+    1) "Fed holds rates steady, signals potential cuts later this year."
+    2) "Stock Market Today: Dow Closes Slightly Lower Ahead of Fed Meeting"
+    3) "Analyst upgrades MicroTech Inc. (MCTK) to 'Outperform'"
+    ```json
+    {
+      "results": [
+        {"id": 1, "significant": true, "category": "Economy", "reason": "FOMC rate decision/outlook"},
+        {"id": 2, "significant": false, "category": "Stocks", "reason": "Routine market summary"},
+        {"id": 3, "significant": false, "category": "Stocks", "reason": "Minor analyst rating"}
+      ]
+    }
+    ```
+
+    **FINAL JSON OUTPUT (ONLY the JSON object):**"""
+
+
+# --- Ollama Significance & Category Evaluation Functions ---
+_SYSTEM_PROMPT = 'You are a financial news evaluator. Analyze the headline based ONLY on the user\'s criteria. Your entire response MUST be ONLY a single valid JSON object in the specified format: {"significant": boolean, "category": "CategoryString", "reason": "Brief ReasonString"}. Do not include explanations, apologies, markdown, or any text outside the JSON structure.'
+_BATCH_SYSTEM_PROMPT = 'You are a financial news evaluator. Analyze each numbered headline based ONLY on the user\'s criteria. Your entire response MUST be ONLY a single valid JSON object in the specified format: {"results": [{"id": number, "significant": boolean, "category": "CategoryString", "reason": "Brief ReasonString"}, ...]} with exactly one entry per headline. Do not include explanations, apologies, markdown, or any text outside the JSON structure.'
+
+async def _ask_ollama(client: ollama.AsyncClient, prompt: str, system_prompt: str, num_predict: int, description: str):
+    """
+    Sends one prompt to Ollama (format='json') and returns the parsed JSON value, or None on any failure.
+    description is only used in log messages.
+    """
     try:
-        client = ollama.AsyncClient(timeout=60)
         response = await client.chat(
             model=config.OLLAMA_MODEL,
             messages=[
                 # System prompt reinforcing JSON-only output
-                {'role': 'system', 'content': 'You are a financial news evaluator. Analyze the headline based ONLY on the user\'s criteria. Your entire response MUST be ONLY a single valid JSON object in the specified format: {"significant": boolean, "category": "CategoryString", "reason": "Brief ReasonString"}. Do not include explanations, apologies, markdown, or any text outside the JSON structure.'},
+                {'role': 'system', 'content': system_prompt},
                 {'role': 'user', 'content': prompt}
             ],
             options={
                  "temperature": 0.1, # Keep low for consistency
-                 "num_predict": 100  # Allow reasonable length for JSON
+                 "num_predict": num_predict # Allow reasonable length for JSON
             },
             # Keep format='json' from previous step
             format='json'
@@ -172,28 +312,10 @@ async def evaluate_significance_and_category(text: str) -> dict | None:
         result_text = response['message']['content'].strip()
 
         # --- Attempt to parse the JSON response ---
+        # Models occasionally wrap the object in extra text despite format='json'; salvage the {...} part first
+        json_match = JSON_OBJECT_PATTERN.search(result_text)
         try:
-            # Now directly load the result text, hoping it's valid JSON
-            data = json.loads(result_text)
-
-            # Validate expected keys and types
-            if isinstance(data.get("significant"), bool) and isinstance(data.get("category"), str):
-                # Normalize category
-                category = data.get("category", "Unknown").strip().capitalize()
-                if category not in config.CATEGORIES:
-                    logger.warning(f"LLM returned unknown category '{category}'. Using 'General'.")
-                    category = "General" # Or maybe Unknown
-
-                data["category"] = category # Ensure normalized category is stored
-                data["reason"] = data.get("reason", "").strip() # Clean reason
-
-                log_level = logging.INFO if data["significant"] else logging.DEBUG # Log ignored ones as debug
-                logger.log(log_level, f"{'SIGNIFICANT' if data['significant'] else 'IGNORE'} ({data['category']}): '{text[:60]}...' | Reason: {data.get('reason','')}")
-                return data # Return the parsed data
-            else:
-                logger.error(f"LLM JSON missing required keys ('significant', 'category') or wrong types (format='json' used): '{result_text}'")
-                return None
-
+            return _json_loads(json_match.group(0) if json_match else result_text)
         except json.JSONDecodeError as json_e:
             logger.error(f"Failed to decode JSON from LLM response (format='json' used): {json_e}")
             logger.error(f"LLM Raw Text: '{result_text}'")
@@ -203,85 +325,251 @@ async def evaluate_significance_and_category(text: str) -> dict | None:
          logger.error(f"Ollama API Error during evaluation: {e.status_code} - {e.error}")
          return None
     except asyncio.TimeoutError:
-        logger.error(f"Ollama evaluation timed out for: '{text[:60]}...'")
+        logger.error(f"Ollama evaluation timed out for: {description}")
         return None
     except Exception as e:
         logger.error(f"Unexpected error during Ollama evaluation: {type(e).__name__} - {e}", exc_info=True)
         return None
 
-
-# --- DeepL Translation Function (Using Placeholder Workaround - Unchanged) ---
-async def translate_en_to_el(text: str) -> str | None:
+def _normalize_evaluation(data, text: str) -> dict | None:
     """
-    Translates English text to Modern Greek using DeepL API,
-    preserving specific terms defined in config.NO_TRANSLATE_TERMS.
+    Validates one evaluation object from the LLM and normalizes it to
+    {"significant": bool, "category": str, "reason": str}. Returns None if invalid.
     """
-    if not deepl_translator:
-        logger.error("DeepL translator not available.")
-        return None
-    if not text:
-        logger.warning("Received empty text for DeepL translation.")
+    # Validate expected keys and types
+    if not (isinstance(data, dict) and isinstance(data.get("significant"), bool) and isinstance(data.get("category"), str)):
+        logger.error(f"LLM JSON missing required keys ('significant', 'category') or wrong types for '{text[:60]}...': {data}")
         return None
 
+    # Normalize category
+    raw_category = data["category"].strip()
+    category = config.CATEGORY_LOOKUP.get(raw_category.lower()) # Canonical (interned) name, or None
+    if category is None:
+        logger.warning(f"LLM returned unknown category '{raw_category}'. Using 'General'.")
+        category = "General" # Or maybe Unknown
+
+    evaluation = {
+        "significant": data["significant"],
+        "category": category, # Ensure normalized category is stored
+        "reason": str(data.get("reason") or "").strip() # Clean reason
+    }
+    log_level = logging.INFO if evaluation["significant"] else logging.DEBUG # Log ignored ones as debug
+    logger.log(log_level, f"{'SIGNIFICANT' if evaluation['significant'] else 'IGNORE'} ({evaluation['category']}): '{text[:60]}...' | Reason: {evaluation['reason']}")
+    return evaluation
+
+async def _evaluate_single(text: str) -> dict | None:
+    """Evaluates one headline with the single-headline prompt."""
+    data = await _ask_ollama(ollama_client, _PROMPT_PREFIX + text + _PROMPT_SUFFIX, _SYSTEM_PROMPT, 100, f"'{text[:60]}...'")
+    return _normalize_evaluation(data, text) if data is not None else None
+
+async def _evaluate_many(texts: list[str]) -> list[dict | None]:
+    """
+    Evaluates several headlines with one batch prompt. Headlines the reply doesn't cover with a valid evaluation
+    (failed/truncated/unparseable reply, missing id, invalid item) are retried one by one with the single prompt,
+    so a bad batch reply doesn't lose every headline in it.
+    """
+    numbered = '\n'.join(f'    {number}) "{text}"' for number, text in enumerate(texts, start=1))
+    data = await _ask_ollama(ollama_batch_client, _BATCH_PROMPT_PREFIX + numbered + _BATCH_PROMPT_SUFFIX, _BATCH_SYSTEM_PROMPT,
+                             100 * len(texts), f"batch of {len(texts)} headlines")
+    items = data.get("results") if isinstance(data, dict) else None
+    results = [None] * len(texts)
+    if isinstance(items, list):
+        items_by_id = {}
+        for item in items:
+            try:
+                items_by_id[int(item["id"])] = item # Models sometimes send the id as a string
+            except (TypeError, ValueError, KeyError):
+                continue
+        for number, text in enumerate(texts, start=1):
+            item = items_by_id.get(number)
+            if item is None:
+                logger.warning(f"LLM batch reply is missing headline {number}: '{text[:60]}...'")
+            else:
+                results[number - 1] = _normalize_evaluation(item, text)
+    elif data is not None:
+        logger.error(f"LLM batch reply has no 'results' array: {str(data)[:200]}")
+
+    # --- Fallback: evaluate uncovered headlines individually ---
+    failed = [index for index, result in enumerate(results) if result is None]
+    if failed:
+        logger.warning(f"Re-evaluating {len(failed)} of {len(texts)} batch headlines individually.")
+        for index in failed:
+            results[index] = await _evaluate_single(texts[index])
+    return results
+
+async def evaluate_batch(texts: list[str]) -> list[dict | None]:
+    """
+    Uses Ollama to evaluate significance AND category for several headlines.
+    Returns one {"significant": bool, "category": str, "reason": str} (or None on failure) per input, in order.
+    Prefiltered and cached headlines skip Ollama; the rest are sent config.OLLAMA_BATCH_SIZE headlines per prompt.
+    """
+    results = [None] * len(texts)
+    pending = {} # cache key -> (headline, indices); duplicate headlines are evaluated once
+    for index, text in enumerate(texts):
+        if not text:
+            logger.warning("Received empty text for evaluation.")
+            continue
+        if IGNORE_PATTERN.search(text):
+            logger.debug(f"IGNORE (prefilter): '{text[:60]}...'")
+            results[index] = {"significant": False, "category": "General", "reason": "prefilter"}
+            continue
+        cache_key = _cache_key(text)
+        cached = _cache_get(evaluation_cache, cache_key, config.EVALUATION_TTL_SECONDS)
+        if cached is not None:
+            logger.debug(f"Evaluation cache hit: '{text[:60]}...'")
+            results[index] = dict(cached) # Copy, so callers can't modify the cached result
+        elif cache_key in pending:
+            pending[cache_key][1].append(index)
+        else:
+            pending[cache_key] = (text, [index])
+
+    pending_items = list(pending.items())
+    for start in range(0, len(pending_items), config.OLLAMA_BATCH_SIZE):
+        batch = pending_items[start:start + config.OLLAMA_BATCH_SIZE]
+        batch_texts = [text for _, (text, _) in batch]
+        # A lone headline keeps the single-headline prompt (with its worked examples)
+        evaluations = [await _evaluate_single(batch_texts[0])] if len(batch) == 1 else await _evaluate_many(batch_texts)
+        for (cache_key, (_, indices)), evaluation in zip(batch, evaluations):
+            if evaluation is None:
+                continue
+            _cache_put(evaluation_cache, cache_key, dict(evaluation))
+            for index in indices:
+                results[index] = dict(evaluation)
+    return results
+
+async def evaluate_significance_and_category(text: str) -> dict | None:
+    """
+    Uses Ollama to evaluate headline significance AND determine its category.
+    Outputs: {"significant": bool, "category": str, "reason": str}
+    """
+    return (await evaluate_batch([text]))[0]
+
+
+# --- DeepL Translation Functions (Using Placeholder Workaround) ---
+def _protect_terms(text: str) -> tuple[str, dict[str, str], bool]:
+    """
+    Replaces no-translate terms with numbered placeholders.
+    Returns (text with placeholders, placeholder -> original term, whether anything is left for DeepL to translate).
+    """
     placeholders = {}
-    current_text = text
-    placeholder_index = 0
 
-    # 1. Pre-process: Replace terms with placeholders
-    for term in config.NO_TRANSLATE_TERMS:
-        if re.search(r'\W', term): # If term has non-word chars (like EUR/USD)
-             pattern = re.compile(re.escape(term), re.IGNORECASE)
-        else: # Otherwise, use word boundaries
-             pattern = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
-
-        matches = list(pattern.finditer(current_text))
-        for match in reversed(matches):
-            original_term = match.group(0) # Get the exact matched text (with original casing)
-            placeholder = f"__PLACEHOLDER_{placeholder_index}__"
-            placeholders[placeholder] = original_term
-            current_text = current_text[:match.start()] + placeholder + current_text[match.end():]
-            placeholder_index += 1
-            logger.debug(f"Replaced '{original_term}' with '{placeholder}'")
+    # One forward pass, slicing the original text at the match offsets
+    segments = []
+    untouched = [] # The text between kept terms, i.e. what DeepL would actually have to translate
+    last_end = 0
+    for start, end in find_no_translate_spans(text):
+        original_term = text[start:end] # Exact matched text (with original casing)
+        placeholder = f"__PLACEHOLDER_{len(placeholders)}__"
+        placeholders[placeholder] = original_term
+        untouched.append(text[last_end:start])
+        segments.append(text[last_end:start])
+        segments.append(placeholder)
+        last_end = end
+        logger.debug(f"Replaced '{original_term}' with '{placeholder}'")
+    untouched.append(text[last_end:])
+    segments.append(text[last_end:])
 
     if not placeholders:
          logger.debug("No terms found to replace with placeholders.")
 
-    processed_text = current_text # Text with placeholders ready for translation
-    logger.debug(f"Text sent to DeepL: '{processed_text[:100]}...'")
+    # Only kept terms, digits, punctuation left? Then there is nothing for DeepL to do.
+    return ''.join(segments), placeholders, not UNTRANSLATABLE_PATTERN.fullmatch(''.join(untouched))
+
+def _restore_terms(translated_text: str, placeholders: dict[str, str]) -> str:
+    """Replaces placeholders (as DeepL may have re-spaced/re-cased them) back with the original terms."""
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: placeholders.get(f"__PLACEHOLDER_{match.group(1)}__", match.group(0)),
+        translated_text
+    )
 
-    # 2. Translate the processed text
+async def _translate_chunk(processed_texts: list[str]) -> list[str | None]:
+    """Translates up to config.DEEPL_BATCH_SIZE placeholder-protected texts in one DeepL request (None per text on failure)."""
     try:
         loop = asyncio.get_running_loop()
         def sync_translate():
-            # No glossary argument needed now
-            return deepl_translator.translate_text(processed_text, target_lang="EL")
-
-        result = await loop.run_in_executor(None, sync_translate)
-
-        if result and result.text:
-            translated_with_placeholders = result.text
-            logger.debug(f"Received from DeepL: '{translated_with_placeholders[:100]}...'")
+            # A list of texts is sent as one request (repeated text= parameters); results come back in order
+            return deepl_translator.translate_text(processed_texts, target_lang="EL")
 
-            # 3. Post-process: Replace placeholders back with original terms
-            final_translation = translated_with_placeholders
-            for placeholder, original_term in sorted(placeholders.items(), key=lambda item: len(item[0]), reverse=True):
-                final_translation = final_translation.replace(placeholder, original_term)
-                logger.debug(f"Reverted '{placeholder}' back to '{original_term}'")
-
-            logger.info(f"DeepL Final Translation: '{final_translation[:60]}...'")
-            return final_translation
-        else:
-            logger.warning(f"DeepL translation returned empty result for processed text: '{processed_text[:60]}...'")
-            return None
+        results = await loop.run_in_executor(deepl_executor, sync_translate)
+        return [result.text if result and result.text else None for result in results]
 
     except DeepLException as e:
         logger.error(f"DeepL API error: {e}")
         if "Quota" in str(e) or "limit" in str(e): logger.error(">>> DeepL Quota likely exceeded! <<<")
         elif "Authorization" in str(e) or "AuthKey" in str(e): logger.error(">>> DeepL API Key seems invalid! <<<")
-        return None
     except Exception as e:
         logger.error(f"Unexpected error during DeepL translation: {type(e).__name__} - {e}", exc_info=True)
-        return None
+    return [None] * len(processed_texts)
+
+async def translate_batch(texts: list[str]) -> list[str | None]:
+    """
+    Translates English texts to Modern Greek using DeepL API, preserving config.NO_TRANSLATE_TERMS.
+    Returns one translation (or None on failure) per input, in order.
+    Cached and untranslatable texts skip DeepL; the rest are sent config.DEEPL_BATCH_SIZE texts per request.
+    """
+    results = [None] * len(texts)
+    if not deepl_translator:
+        logger.error("DeepL translator not available.")
+        return results
+
+    pending = {} # cache key -> (text with placeholders, placeholders, indices); duplicate texts are translated once
+    for index, text in enumerate(texts):
+        if not text:
+            logger.warning("Received empty text for DeepL translation.")
+            continue
+        cache_key = _cache_key(text)
+        cached = _cache_get(translation_cache, cache_key)
+        if cached is not None:
+            logger.debug(f"Translation cache hit: '{text[:60]}...'")
+            results[index] = cached
+        elif cache_key in pending:
+            pending[cache_key][2].append(index)
+        else:
+            processed_text, placeholders, translatable = _protect_terms(text)
+            if not translatable:
+                logger.info(f"Skipping DeepL, nothing translatable in: '{text[:60]}...'")
+                results[index] = text
+                continue
+            logger.debug(f"Text sent to DeepL: '{processed_text[:100]}...'")
+            pending[cache_key] = (processed_text, placeholders, [index])
+
+    pending_items = list(pending.items())
+    chunks = [pending_items[start:start + config.DEEPL_BATCH_SIZE] for start in range(0, len(pending_items), config.DEEPL_BATCH_SIZE)]
+    # Chunks run in parallel on deepl_executor (only matters for more than DEEPL_BATCH_SIZE texts)
+    chunk_translations = await asyncio.gather(*(_translate_chunk([processed_text for _, (processed_text, _, _) in chunk]) for chunk in chunks))
+    for chunk, translations in zip(chunks, chunk_translations):
+        for (cache_key, (processed_text, placeholders, indices)), translated_with_placeholders in zip(chunk, translations):
+            if not translated_with_placeholders:
+                logger.warning(f"DeepL translation returned empty result for processed text: '{processed_text[:60]}...'")
+                continue
+            logger.debug(f"Received from DeepL: '{translated_with_placeholders[:100]}...'")
+            final_translation = _restore_terms(translated_with_placeholders, placeholders)
+            logger.info(f"DeepL Final Translation: '{final_translation[:60]}...'")
+            _cache_put(translation_cache, cache_key, final_translation)
+            for index in indices:
+                results[index] = final_translation
+    return results
+
+async def translate_en_to_el(text: str) -> str | None:
+    """
+    Translates English text to Modern Greek using DeepL API,
+    preserving specific terms defined in config.NO_TRANSLATE_TERMS.
+    """
+    return (await translate_batch([text]))[0]
+
+
+# --- Shutdown ---
+async def close():
+    """Closes the shared Ollama clients and the DeepL thread pool. Called when the bot shuts down."""
+    try:
+        await ollama_client.close()
+        await ollama_batch_client.close()
+        logger.info("Ollama clients closed.")
+    except Exception as e:
+        logger.error(f"Error closing Ollama client: {e}")
+    deepl_executor.shutdown(wait=False, cancel_futures=True) # Don't block shutdown on in-flight translations
+    if deepl_translator:
+        deepl_translator.close() # Releases the pooled DeepL connections
 
 
 # --- Example usage (for testing this file directly - Unchanged) ---
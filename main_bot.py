@@ -3,17 +3,22 @@ from discord.ext import tasks, commands
 import asyncio
 import logging
 from datetime import datetime, timezone
-from collections import deque
+from collections import OrderedDict
+import time
+import functools
 import aiohttp
 import re # Import regex for cleaning titles
 
 # Import fuzzy matching and sentiment analysis libraries
-from thefuzz import fuzz
+from rapidfuzz import fuzz, process
+import numpy # rapidfuzz.process.cdist returns a numpy matrix
+import ahocorasick # Multi-pattern matching for user keywords
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 import config  # Import configuration variables (loads .env)
 import scraper # Import scraping functions
 import llm_handler # Import LLM functions (Ollama for Eval, DeepL for Translate)
+import seen_store # SQLite persistence for seen headlines (survives restarts)
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -33,18 +38,42 @@ logger = logging.getLogger(__name__)
 intents = discord.Intents.default()
 # Remove message content intent if not using prefix commands heavily
 # intents.message_content = True # Uncomment if you have prefix commands that need content
-bot = commands.Bot(command_prefix="!", intents=intents)
+class NewsBot(commands.Bot):
+    async def close(self):
+        """Releases shared clients and worker pools before disconnecting."""
+        await llm_handler.close()
+        await scraper.close()
+        seen_store.close()
+        await super().close()
+
+bot = NewsBot(command_prefix="!", intents=intents)
 
 # --- State Management ---
+# Bounded insertion-ordered dicts (keys only): O(1) membership tests, oldest entries evicted first.
+# They cache the most recent part of seen_store (SQLite), which holds the full history and survives restarts.
 MAX_SEEN_HEADLINES = 1000 # Store more history for deduplication
-seen_headlines = deque(maxlen=MAX_SEEN_HEADLINES)
-# Deque for normalized titles for cross-source deduplication
+seen_headlines = OrderedDict.fromkeys(seen_store.recent_ids(MAX_SEEN_HEADLINES))
+# Normalized titles for cross-source deduplication
 MAX_SEEN_TITLES = 200 # How many recent titles to check for fuzzy match
-seen_normalized_titles = deque(maxlen=MAX_SEEN_TITLES)
+seen_normalized_titles = OrderedDict.fromkeys(seen_store.recent_titles(MAX_SEEN_TITLES))
+# Recent LLM evaluations by normalized title, reused for the same or a near-identical headline
+MAX_EVALUATION_MEMO = 1000 # Longer than the fuzzy dedup window, so it also covers headlines that resurface later
+EVALUATION_MEMO_TTL_SECONDS = config.EVALUATION_TTL_SECONDS # Same expiry as llm_handler's evaluation cache, so expired headlines reach Ollama again
+EVALUATION_MEMO_MATCH_THRESHOLD = 92 # fuzz.ratio needed to reuse a near-identical headline's evaluation
+evaluation_memo = OrderedDict() # normalized title -> (time stored, evaluation); oldest first
 
 # Initialize Sentiment Analyzer
 sentiment_analyzer = SentimentIntensityAnalyzer()
 
+# --- User Keyword Matching ---
+# Single pass per headline regardless of keyword count (keywords are already lowercased in config)
+keyword_automaton = None
+if config.USER_KEYWORDS:
+    keyword_automaton = ahocorasick.Automaton()
+    for keyword in config.USER_KEYWORDS:
+        keyword_automaton.add_word(keyword, keyword)
+    keyword_automaton.make_automaton()
+
 # --- Bot Events ---
 @bot.event
 async def on_ready():
@@ -56,6 +85,7 @@ async def on_ready():
     logger.info(f"Using DeepL API for translation: {'Enabled' if config.DEEPL_API_KEY else 'DISABLED (No API Key)'}")
     logger.info(f"User Keywords: {len(config.USER_KEYWORDS)} | No-Translate Terms: {len(config.NO_TRANSLATE_TERMS)}")
     logger.info(f"Fuzzy Match Threshold: {config.FUZZY_MATCH_THRESHOLD}")
+    await scraper.get_session() # Prime the shared HTTP session before the first scrape cycle
 
     channel = bot.get_channel(config.DISCORD_CHANNEL_ID)
     if channel:
@@ -77,14 +107,209 @@ async def on_ready():
         logger.error("Bot tasks will not start. Shutting down.")
         await bot.close()
 
+# --- Helper Function: Seen History ---
+def remember_seen(history: OrderedDict, key: str, max_size: int):
+    """Adds (or refreshes) a key in a bounded history, evicting the oldest entry when it is full."""
+    history[key] = None
+    history.move_to_end(key)
+    if len(history) > max_size:
+        history.popitem(last=False)
+
+def headline_seen(unique_id: str) -> bool:
+    """Checks the in-memory history first, then the database (headlines older than it, or from before a restart)."""
+    if unique_id in seen_headlines: return True
+    if seen_store.has_seen(unique_id):
+        remember_seen(seen_headlines, unique_id, MAX_SEEN_HEADLINES)
+        return True
+    return False
+
 # --- Helper Function: Normalize Title ---
-def normalize_title(title: str) -> str:
-    """Converts title to lowercase and removes punctuation for comparison."""
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+@functools.lru_cache(maxsize=2048) # The same titles recur across scrape cycles
+def normalize_title(title: str, *, is_lower: bool = False) -> str:
+    """Converts title to lowercase (unless is_lower says it already is) and removes punctuation for comparison."""
     if not title: return ""
-    text = title.lower()
-    text = re.sub(r'[^\w\s]', '', text) # Remove punctuation
-    text = ' '.join(text.split()) # Normalize whitespace
-    return text
+    if not is_lower: title = title.lower()
+    return WHITESPACE_PATTERN.sub(' ', PUNCTUATION_PATTERN.sub('', title)).strip()
+
+# --- Helper Function: Fuzzy Duplicate Search ---
+def find_fuzzy_duplicates(titles: list[str], seen_titles: list[str]) -> list[str | None]:
+    """
+    Compares every normalized title against every seen title in a single RapidFuzz cdist call (C++, multi-threaded).
+    Returns, for each title, a seen title scoring >= FUZZY_MATCH_THRESHOLD (token_set_ratio), or None.
+    """
+    if not titles or not seen_titles:
+        return [None] * len(titles)
+    # Fast path: an identical normalized title scores 100 anyway. This covers most of each cycle,
+    # since every scrape returns the same front-page headlines again.
+    seen_set = set(seen_titles)
+    matches = [title if title in seen_set else None for title in titles]
+    remaining = [index for index, title in enumerate(titles) if title and matches[index] is None]
+    if not remaining:
+        return matches
+
+    # score_cutoff zeroes everything below the threshold, so any non-zero score is a duplicate.
+    # processor=None: titles are already normalized by normalize_title(), don't preprocess them again per pair.
+    scores = process.cdist([titles[index] for index in remaining], seen_titles, scorer=fuzz.token_set_ratio, processor=None,
+                           score_cutoff=config.FUZZY_MATCH_THRESHOLD, dtype=numpy.uint8, workers=-1)
+    best = scores.argmax(axis=1)
+    for row, index in enumerate(remaining):
+        if scores[row, best[row]]:
+            matches[index] = seen_titles[best[row]]
+    return matches
+
+# --- Helper Functions: Evaluation Memo ---
+def recall_evaluation(normalized_title: str) -> dict | None:
+    """Returns a stored evaluation for this (or a near-identical) normalized title, or None."""
+    if not normalized_title: return None
+    expiry_cutoff = time.monotonic() - EVALUATION_MEMO_TTL_SECONDS
+    while evaluation_memo and next(iter(evaluation_memo.values()))[0] < expiry_cutoff:
+        evaluation_memo.popitem(last=False) # Drop expired entries (oldest are first)
+
+    entry = evaluation_memo.get(normalized_title)
+    if entry is None and evaluation_memo:
+        # Symmetric, order-sensitive scorer: token_set_ratio would score 100 for a short title contained in a longer,
+        # different headline ("oil prices fall" vs "oil prices fall 8% after opec ..."), reusing the wrong verdict
+        match = process.extractOne(normalized_title, evaluation_memo.keys(), scorer=fuzz.ratio, processor=None,
+                                   score_cutoff=EVALUATION_MEMO_MATCH_THRESHOLD)
+        if match:
+            logger.debug(f"Reusing evaluation of similar headline '{match[0][:60]}...' for '{normalized_title[:60]}...'")
+            entry = evaluation_memo[match[0]]
+    return dict(entry[1]) if entry else None
+
+def remember_evaluation(normalized_title: str, evaluation: dict):
+    """Stores an evaluation, evicting the oldest entry when the memo is full."""
+    if not normalized_title: return
+    evaluation_memo.pop(normalized_title, None) # Re-insert at the end so the memo stays ordered by time stored
+    evaluation_memo[normalized_title] = (time.monotonic(), dict(evaluation))
+    if len(evaluation_memo) > MAX_EVALUATION_MEMO:
+        evaluation_memo.popitem(last=False)
+
+async def evaluate_cached(headlines: list[tuple[str, str]]) -> list[dict | None]:
+    """
+    Evaluates (normalized_title, raw_title) pairs, in order. Headlines with a recent evaluation
+    (exact or near-identical title) skip Ollama; the rest are sent to llm_handler.evaluate_batch.
+    """
+    results = [recall_evaluation(normalized_title) for normalized_title, _ in headlines]
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        evaluations = await llm_handler.evaluate_batch([headlines[index][1] for index in missing])
+        for index, evaluation in zip(missing, evaluations):
+            results[index] = evaluation
+            if evaluation: remember_evaluation(headlines[index][0], evaluation)
+    return results
+
+# --- Helper Function: Sentiment ---
+MAX_SENTIMENT_TITLE_LENGTH = 300 # VADER can go quadratic on long/odd input; headlines are far shorter
+MAX_SENTIMENT_NON_ASCII = 20 # Emoji/emoticon-heavy text is VADER's slow path
+SENTIMENT_TIMEOUT_SECONDS = 1.0
+
+async def score_sentiment(title: str) -> float:
+    """Returns VADER's compound score for a title, or 0.0 (neutral) for suspicious input or when scoring is too slow."""
+    if len(title) > MAX_SENTIMENT_TITLE_LENGTH or sum(not char.isascii() for char in title) > MAX_SENTIMENT_NON_ASCII:
+        logger.debug(f"Skipping sentiment analysis for unusual title: '{title[:60]}...'")
+        return 0.0
+    try:
+        # Worker thread + timeout, so a pathological title can't stall the event loop
+        scores = await asyncio.wait_for(asyncio.to_thread(sentiment_analyzer.polarity_scores, title), SENTIMENT_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning(f"Sentiment analysis timed out for: '{title[:60]}...'")
+        return 0.0
+    return scores['compound']
+
+# --- Helper: Post Rate Limiting ---
+class TokenBucket:
+    """Allows up to `rate` acquisitions per `per` seconds, refilling continuously (monotonic clock)."""
+    def __init__(self, rate: int = 5, per: float = 5.0):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until a token is available, then takes it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+
+# Discord allows 5 messages per 5 seconds per channel; sleep only when that budget is used up
+post_bucket = TokenBucket(rate=5, per=5.0)
+
+# --- Helper Functions: Build Post ---
+def assess_headline(title: str, lowered_title: str, evaluation_result: dict | None) -> tuple[str, str] | None:
+    """
+    Applies the user keyword boost (matched against lowered_title, i.e. title.lower()) to an LLM evaluation.
+    Returns (category, reason) for a headline that should be posted, or None (not significant, or evaluation failed).
+    """
+    # --- User Keyword Check ---
+    boost_by_keyword = False
+    if keyword_automaton:
+        match = next(keyword_automaton.iter(lowered_title), None)
+        if match is not None:
+            logger.info(f"Headline significance boosted by user keyword: '{match[1]}'")
+            boost_by_keyword = True
+
+    if not evaluation_result:
+        # LLM evaluation itself failed
+        logger.warning(f"LLM evaluation failed for headline: '{title[:80]}...'")
+        return None
+
+    is_significant_llm = evaluation_result["significant"]
+    category = evaluation_result["category"] # Already normalized in llm_handler
+    reason = evaluation_result["reason"]
+
+    # Apply user keyword boost
+    is_significant_final = is_significant_llm or boost_by_keyword
+    if boost_by_keyword and not is_significant_llm:
+        logger.info(f"Overriding LLM: Marking as significant due to user keyword for '{title[:60]}...'")
+        # Ensure a valid category if LLM ignored it
+        if category not in config.CATEGORY_SET or category == "Unknown": category = "General"
+
+    if not is_significant_final:
+        # Ignored by LLM (and not boosted by keyword)
+        logger.info(f"Skipping post for non-significant headline ({category}): '{title[:80]}...'")
+        return None
+    return category, reason
+
+async def build_headline_embed(title: str, url: str, category: str, reason: str, greek_translation: str) -> discord.Embed:
+    """Scores sentiment for a significant, translated headline and returns its embed."""
+    # --- Sentiment Analysis ---
+    sentiment_score = await score_sentiment(title)
+    sentiment_label = "Neutral"
+    embed_color = config.category_color(category)
+
+    if sentiment_score >= config.SENTIMENT_POSITIVE_THRESHOLD:
+        sentiment_label = "Positive"
+        # Optional: Override color based on sentiment for specific categories
+        # if category == "Stocks": embed_color = discord.Color.green()
+    elif sentiment_score <= config.SENTIMENT_NEGATIVE_THRESHOLD:
+        sentiment_label = "Negative"
+        # if category == "Stocks": embed_color = discord.Color.red()
+
+    logger.info(f"Prepared translated headline. Sentiment: {sentiment_label} ({sentiment_score:.2f})")
+
+    # --- Create Embed ---
+    embed_description = f"{greek_translation}\n\n*Category: {category} | Sentiment: {sentiment_label}*"
+    # Optionally add LLM's reason if available and not just generic
+    if reason and reason.lower() not in ["significant news", "meets criteria"]:
+        embed_description += f" | _{reason}_"
+
+    # Footer and Timestamp are intentionally omitted
+    return discord.Embed(
+        title=f"📰 {title}", # Original English Title
+        url=url, # Use the original url variable
+        description=embed_description,
+        color=embed_color
+    )
 
 # --- Background Tasks ---
 @tasks.loop(minutes=config.HEARTBEAT_INTERVAL_MINUTES)
@@ -93,6 +318,7 @@ async def heartbeat_task(channel: discord.TextChannel):
     now_utc = datetime.now(timezone.utc)
     message = f"🟢 Bot operational. Status check at {now_utc.strftime('%Y-%m-%d %H:%M:%S %Z')}."
     try:
+        await post_bucket.acquire() # Shares the channel's rate limit with news posts
         await channel.send(message)
         logger.info("Heartbeat message sent.")
     except discord.errors.ConnectionClosed as e:
@@ -105,7 +331,7 @@ async def check_news_task(channel: discord.TextChannel):
     """Periodically scrapes news, evaluates, deduplicates, translates, and posts."""
     logger.info(f"Starting news check cycle (Interval: {config.SCRAPE_INTERVAL_SECONDS}s)...")
     try:
-        all_new_headlines = await scraper.scrape_all(config.NEWS_SOURCES)
+        all_new_headlines = await scraper.scrape_all(config.NEWS_SOURCES, config.MAX_CONCURRENT_SCRAPES)
         posted_count = 0
         processed_count = 0
         # Set for deduplication within this specific cycle run
@@ -116,142 +342,103 @@ async def check_news_task(channel: discord.TextChannel):
             logger.info(f"Processing {len(headlines)} headlines from {source}...")
 
             # Process headlines from oldest to newest within the batch
+            candidates = [] # (title, url, unique_id, normalized_title, lowered_title) of headlines not yet seen this cycle
             for title, url, detected_time in reversed(headlines):
                 processed_count += 1
 
                 # --- Basic Info & Normalization ---
                 unique_id = f"{source}:{url}"
-                normalized_title_current = normalize_title(title)
 
                 # --- Deduplication Step 1: Within this cycle ---
                 if unique_id in cycle_processed_ids:
                     logger.debug(f"Skipped (duplicate within this cycle): '{unique_id}'")
                     continue
                 cycle_processed_ids.add(unique_id)
+                lowered_title = title.lower() # Lowercased once, shared by normalization and the keyword check
+                candidates.append((title, url, unique_id, normalize_title(lowered_title, is_lower=True), lowered_title))
+
+            # Score every candidate against recent history in one vectorized call
+            history_matches = find_fuzzy_duplicates([candidate[3] for candidate in candidates], list(seen_normalized_titles))
 
+            new_headlines = [] # (title, url, normalized_title, lowered_title) of headlines that passed deduplication
+            batch_titles = [] # Normalized titles added to history during this batch (not covered by the call above)
+            for (title, url, unique_id, normalized_title_current, lowered_title), similar_title in zip(candidates, history_matches):
                 # --- Deduplication Step 2: Fuzzy Title Match against recent history ---
-                is_title_duplicate = False
-                if normalized_title_current: # Only check if title is valid
-                    for seen_title in seen_normalized_titles:
-                        similarity = fuzz.token_set_ratio(normalized_title_current, seen_title)
-                        if similarity >= config.FUZZY_MATCH_THRESHOLD:
-                            logger.info(f"Skipped (Fuzzy Title Match >= {config.FUZZY_MATCH_THRESHOLD}%): '{title[:60]}...' similar to '{seen_title[:60]}...'")
-                            is_title_duplicate = True
-                            # Add the exact unique_id to main seen list anyway to prevent exact re-post later
-                            if unique_id not in seen_headlines: seen_headlines.append(unique_id)
-                            break # Stop checking once a duplicate is found
-                if is_title_duplicate:
+                if similar_title is None and normalized_title_current: # Only check if title is valid
+                    similar_title = next((seen_title for seen_title in batch_titles
+                                          if fuzz.token_set_ratio(normalized_title_current, seen_title, processor=None, score_cutoff=config.FUZZY_MATCH_THRESHOLD)), None)
+                if similar_title is not None:
+                    logger.info(f"Skipped (Fuzzy Title Match >= {config.FUZZY_MATCH_THRESHOLD}%): '{title[:60]}...' similar to '{similar_title[:60]}...'")
+                    # Add the exact unique_id to main seen list anyway to prevent exact re-post later
+                    if not headline_seen(unique_id):
+                        remember_seen(seen_headlines, unique_id, MAX_SEEN_HEADLINES)
+                        seen_store.mark_seen(unique_id)
                     continue # Skip to next headline
 
                 # --- Deduplication Step 3: Exact ID Match against longer history ---
                 logger.debug(f"Checking unique_id: '{unique_id}' | Title: '{title[:50]}...'")
-                if unique_id in seen_headlines:
+                if headline_seen(unique_id):
                     logger.info(f"Skipped (already seen exact ID): '{unique_id}'")
                     # Add normalized title if this is the first time we see it, even if URL was seen
                     if normalized_title_current and normalized_title_current not in seen_normalized_titles:
-                        seen_normalized_titles.append(normalized_title_current)
+                        remember_seen(seen_normalized_titles, normalized_title_current, MAX_SEEN_TITLES)
+                        seen_store.mark_seen(unique_id, normalized_title_current)
+                        batch_titles.append(normalized_title_current)
                     continue # Skip to next headline
 
                 # --- If it's a new headline (passed all checks) ---
                 logger.info(f"NEW Headline: '{unique_id}'")
-                seen_headlines.append(unique_id)
+                remember_seen(seen_headlines, unique_id, MAX_SEEN_HEADLINES)
+                seen_store.mark_seen(unique_id, normalized_title_current)
                 if normalized_title_current:
-                    seen_normalized_titles.append(normalized_title_current) # Add to title deque for future fuzzy checks
-
-
-                # --- User Keyword Check ---
-                boost_by_keyword = False
-                for keyword in config.USER_KEYWORDS:
-                     if keyword in title.lower():
-                         logger.info(f"Headline significance boosted by user keyword: '{keyword}'")
-                         boost_by_keyword = True
-                         break
-
-                # --- Evaluate Significance and Category using LLM ---
-                evaluation_result = await llm_handler.evaluate_significance_and_category(title)
-
-                if evaluation_result:
-                    is_significant_llm = evaluation_result["significant"]
-                    category = evaluation_result["category"] # Already normalized in llm_handler
-                    reason = evaluation_result["reason"]
-
-                    # Apply user keyword boost
-                    is_significant_final = is_significant_llm or boost_by_keyword
-                    if boost_by_keyword and not is_significant_llm:
-                        logger.info(f"Overriding LLM: Marking as significant due to user keyword for '{title[:60]}...'")
-                        # Ensure a valid category if LLM ignored it
-                        if not category or category == "Unknown": category = "General"
-
-
-                    # --- If deemed significant (by LLM or Keyword), proceed ---
-                    if is_significant_final:
-                        logger.info(f"Attempting translation for significant headline ({category}).")
-                        # Call translation function (which handles placeholder logic)
-                        greek_translation = await llm_handler.translate_en_to_el(title)
-
-                        if greek_translation:
-                            # --- Sentiment Analysis ---
-                            sentiment_score = sentiment_analyzer.polarity_scores(title)['compound']
-                            sentiment_label = "Neutral"
-                            embed_color = config.CATEGORIES.get(category, config.DEFAULT_CATEGORY_COLOR)
-
-                            if sentiment_score >= config.SENTIMENT_POSITIVE_THRESHOLD:
-                                sentiment_label = "Positive"
-                                # Optional: Override color based on sentiment for specific categories
-                                # if category == "Stocks": embed_color = discord.Color.green()
-                            elif sentiment_score <= config.SENTIMENT_NEGATIVE_THRESHOLD:
-                                sentiment_label = "Negative"
-                                # if category == "Stocks": embed_color = discord.Color.red()
-
-                            logger.info(f"Posting translated headline. Sentiment: {sentiment_label} ({sentiment_score:.2f})")
-
-                            # --- Create Embed ---
-                            embed_description = f"{greek_translation}\n\n*Category: {category} | Sentiment: {sentiment_label}*"
-                            # Optionally add LLM's reason if available and not just generic
-                            if reason and reason.lower() not in ["significant news", "meets criteria"]:
-                                embed_description += f" | _{reason}_"
-
-                            embed = discord.Embed(
-                                title=f"📰 {title}", # Original English Title
-                                url=url, # Use the original url variable
-                                description=embed_description,
-                                color=embed_color
-                            )
-                            # Footer and Timestamp are intentionally omitted
-
-                            # --- Send to Discord ---
-                            try:
-                                await channel.send(embed=embed)
-                                posted_count += 1
-                                await asyncio.sleep(2) # Throttle posting slightly
-                            except discord.Forbidden:
-                                logger.error(f"Permission error sending to channel {channel.name}. Check bot permissions.")
-                                # Consider stopping the loop for this source or the whole task if permissions are wrong
-                                break # Stop processing this source for now
-                            except discord.RateLimited as e:
-                                logger.warning(f"Discord rate limit hit. Sleeping for {e.retry_after:.2f} seconds...")
-                                await asyncio.sleep(e.retry_after)
-                                try: # Retry sending the same message once after rate limit
-                                    await channel.send(embed=embed)
-                                    posted_count += 1
-                                    await asyncio.sleep(2)
-                                except Exception as retry_e:
-                                    logger.error(f"Error sending Discord message after retry for '{title[:60]}': {retry_e}")
-                            except Exception as e:
-                                logger.error(f"Error sending Discord message for '{title[:60]}': {e}")
-
-                        else:
-                            # Translation failed
-                            logger.warning(f"Translation failed for significant headline: '{title[:80]}...'")
-                            await asyncio.sleep(0.5) # Small delay even on failure
-                    else:
-                        # Ignored by LLM (and not boosted by keyword)
-                        logger.info(f"Skipping post for non-significant headline ({category}): '{title[:80]}...'")
-                        await asyncio.sleep(0.1) # Very small delay
-                else:
-                    # LLM evaluation itself failed
-                    logger.warning(f"LLM evaluation failed for headline: '{title[:80]}...'")
-                    await asyncio.sleep(0.5)
+                    remember_seen(seen_normalized_titles, normalized_title_current, MAX_SEEN_TITLES) # Add to title history for future fuzzy checks
+                    batch_titles.append(normalized_title_current)
+                new_headlines.append((title, url, normalized_title_current, lowered_title))
+
+            if not new_headlines: continue
+
+            # --- Evaluate Significance and Category using LLM (memoized, then batched: one Ollama prompt per OLLAMA_BATCH_SIZE headlines) ---
+            evaluation_results = await evaluate_cached([(normalized_title, title) for title, _, normalized_title, _ in new_headlines])
+
+            # --- Keep headlines deemed significant (by LLM or Keyword) ---
+            significant_headlines = [] # (title, url, category, reason)
+            for (title, url, _, lowered_title), evaluation_result in zip(new_headlines, evaluation_results):
+                assessment = assess_headline(title, lowered_title, evaluation_result)
+                if assessment: significant_headlines.append((title, url, *assessment))
+            if not significant_headlines: continue
+
+            # --- Translate all significant headlines of this source together (one DeepL request per DEEPL_BATCH_SIZE) ---
+            logger.info(f"Translating {len(significant_headlines)} significant headlines from {source}.")
+            translations = await llm_handler.translate_batch([title for title, _, _, _ in significant_headlines])
+            to_post = [] # (title, url, category, reason, greek_translation)
+            for headline, greek_translation in zip(significant_headlines, translations):
+                if greek_translation: to_post.append((*headline, greek_translation))
+                else: logger.warning(f"Translation failed for significant headline: '{headline[0][:80]}...'")
+
+            # --- Build embeds and post serially, in original order ---
+            for title, url, category, reason, greek_translation in to_post:
+                embed = await build_headline_embed(title, url, category, reason, greek_translation)
+
+                # --- Send to Discord ---
+                try:
+                    await post_bucket.acquire()
+                    await channel.send(embed=embed)
+                    posted_count += 1
+                except discord.Forbidden:
+                    logger.error(f"Permission error sending to channel {channel.name}. Check bot permissions.")
+                    # Consider stopping the loop for this source or the whole task if permissions are wrong
+                    break # Stop processing this source for now
+                except discord.RateLimited as e: # Backstop if the bucket and Discord disagree
+                    logger.warning(f"Discord rate limit hit. Sleeping for {e.retry_after:.2f} seconds...")
+                    await asyncio.sleep(e.retry_after)
+                    try: # Retry sending the same message once after rate limit
+                        await post_bucket.acquire()
+                        await channel.send(embed=embed)
+                        posted_count += 1
+                    except Exception as retry_e:
+                        logger.error(f"Error sending Discord message after retry for '{title[:60]}': {retry_e}")
+                except Exception as e:
+                    logger.error(f"Error sending Discord message for '{title[:60]}': {e}")
 
             # Small delay between processing different sources
             await asyncio.sleep(1)
@@ -263,6 +450,10 @@ async def check_news_task(channel: discord.TextChannel):
              logger.info(f"Processed {processed_count} headlines, none met criteria or passed translation.")
         # else: logger.debug("No new headlines found across all sources in this cycle.")
 
+        # --- Forget persisted headlines past the retention window (indexed delete, cheap when nothing expired) ---
+        pruned = seen_store.prune(config.SEEN_DB_RETENTION_DAYS * 24 * 60 * 60)
+        if pruned: logger.info(f"Pruned {pruned} expired entries from the seen-headline store.")
+
 
     except aiohttp.ClientError as e:
         logger.error(f"Network error during scraping cycle: {e}")
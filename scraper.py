@@ -1,31 +1,51 @@
 import aiohttp
-from bs4 import BeautifulSoup
+from aiohttp.resolver import AsyncResolver # Requires aiodns
+from selectolax.lexbor import LexborHTMLParser # Fast C (Lexbor) HTML parser with CSS selectors
 import logging
 from typing import List, Tuple, Dict, Any
 from urllib.parse import urljoin
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# --- Conditional GET Cache ---
+# url -> (ETag, Last-Modified, headlines parsed from that version of the page).
+# Replayed as If-None-Match / If-Modified-Since; a 304 reuses the stored headlines.
+conditional_cache: Dict[str, Tuple[str | None, str | None, List[Tuple[str, str, datetime]]]] = {}
+
 # --- Helper Function ---
-async def fetch_html(session: aiohttp.ClientSession, url: str) -> str | None:
-    """Fetches HTML content from a URL asynchronously."""
+async def fetch_html(session: aiohttp.ClientSession, url: str) -> Tuple[str | None, int | None]:
+    """Fetches HTML content from a URL asynchronously. Returns (html, status); html is None on 304 or error."""
     # Use headers to mimic a browser request
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, br, deflate', # Compressed transfer; aiohttp decodes br when Brotli is installed
         'Connection': 'keep-alive',
         'Pragma': 'no-cache',
         'Cache-Control': 'no-cache',
     }
+    cached = conditional_cache.get(url)
+    if cached and cached[2]: # Only revalidate when there are headlines to replay on 304
+        etag, last_modified, _ = cached
+        if etag: headers['If-None-Match'] = etag
+        if last_modified: headers['If-Modified-Since'] = last_modified
     try:
-        # Added timeout and disable ssl verification for flexibility (though use carefully)
-        async with session.get(url, headers=headers, timeout=20, ssl=False) as response:
+        # TLS certificates are verified (the default); verified sessions can also be resumed on reconnect
+        async with session.get(url, headers=headers, timeout=20) as response:
             response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+            if response.status == 304:
+                logger.info(f"{url} not modified since last fetch (304)")
+                return None, 304
             logger.info(f"Successfully fetched {url} with status {response.status}")
-            return await response.text()
+            # Decode with the declared charset (UTF-8 if none) instead of letting aiohttp sniff the whole page
+            html = await response.text(encoding=response.charset or 'utf-8', errors='replace')
+            # Headlines are filled in once this version of the page parses (see _fetch_and_parse)
+            conditional_cache[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'), [])
+            return html, response.status
     except aiohttp.ClientResponseError as e:
         logger.error(f"HTTP Error fetching {url}: Status {e.status}, Message: {e.message}")
     except aiohttp.ClientConnectionError as e:
@@ -34,28 +54,35 @@ async def fetch_html(session: aiohttp.ClientSession, url: str) -> str | None:
         logger.error(f"Timeout error fetching {url}")
     except Exception as e:
         logger.error(f"Unexpected error fetching {url}: {type(e).__name__} - {e}")
-    return None
+    return None, None
 
-# --- Website Specific Scrapers ---
+# --- Website Specific Parsers (synchronous; run in worker threads) ---
 # IMPORTANT: These selectors are examples and WILL LIKELY BREAK as websites update their structure.
-# They need regular inspection and maintenance.
+# They need regular inspection and maintenance; they are all kept here so that is one place to look.
+# (selectolax/Lexbor takes selectors as strings only - there is no precompiled matcher object to cache.)
+MARKETWATCH_ARTICLE_SELECTOR = 'div.element--article, div.article__content'
+MARKETWATCH_LINK_SELECTOR = 'h3.article__headline > a.link, h3.article__headline > a.article__link, a.link, a[href]'
+CNBC_ARTICLE_SELECTOR = 'div.Card-standardBreakerCard, div.Card-titleContainer, li.LatestNews-item, div[class*="RiverCard-container"]'
+CNBC_LINK_SELECTOR = 'a[href]' # More generic link selector
+CNBC_TITLE_SELECTOR = '.Card-title, .LatestNews-headline, [class*="RiverHeadline-headline"]'
+YAHOO_LINK_SELECTOR = 'li.js-stream-content h3 a[href]' # Select links directly
+YAHOO_FALLBACK_LINK_SELECTOR = 'div[class*="stream-item"] a[href]'
+FINVIZ_TABLE_SELECTOR = 'table.news-table'
+FINVIZ_ROW_SELECTOR = 'tr'
+FINVIZ_LINK_SELECTOR = 'td a.nn-tab-link, td a.tab-link-news'
+SEEKING_ALPHA_LINK_SELECTOR = 'article[data-test-id="post-list-item"] a[data-test-id="post-list-item-title"], div[class*="media-body"] a[href]'
 
-async def scrape_marketwatch(session: aiohttp.ClientSession, config: Dict[str, Any]) -> List[Tuple[str, str, datetime]]:
-    """Scrapes headlines from MarketWatch."""
-    url = config['url']
-    base_url = config['base_url']
-    html = await fetch_html(session, url)
-    if not html: return []
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_marketwatch(html: str, url: str, base_url: str, detection_time: datetime) -> List[Tuple[str, str, datetime]]:
+    """Extracts headlines from MarketWatch HTML."""
+    tree = LexborHTMLParser(html)
     headlines = []
-    detection_time = datetime.now()
     # Selector needs constant checking - this is a common pattern
-    articles = soup.select('div.element--article, div.article__content')
+    articles = tree.css(MARKETWATCH_ARTICLE_SELECTOR)
     for article in articles:
-        headline_tag = article.select_one('h3.article__headline > a.link, h3.article__headline > a.article__link, a.link, a[href]')
-        if headline_tag and headline_tag.text:
-            headline = ' '.join(headline_tag.text.split()) # Clean whitespace
-            link = headline_tag.get('href')
+        headline_tag = article.css_first(MARKETWATCH_LINK_SELECTOR)
+        if headline_tag and headline_tag.text():
+            headline = ' '.join(headline_tag.text().split()) # Clean whitespace
+            link = headline_tag.attributes.get('href')
             absolute_link = urljoin(base_url, link) if link else url
             if headline and absolute_link:
                 headlines.append((headline, absolute_link, detection_time))
@@ -63,23 +90,18 @@ async def scrape_marketwatch(session: aiohttp.ClientSession, config: Dict[str, A
     logger.info(f"MarketWatch: Found {len(headlines)} potential headlines.")
     return headlines
 
-async def scrape_cnbc(session: aiohttp.ClientSession, config: Dict[str, Any]) -> List[Tuple[str, str, datetime]]:
-    """Scrapes headlines from CNBC."""
-    url = config['url']
-    base_url = config['base_url']
-    html = await fetch_html(session, url)
-    if not html: return []
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_cnbc(html: str, url: str, base_url: str, detection_time: datetime) -> List[Tuple[str, str, datetime]]:
+    """Extracts headlines from CNBC HTML."""
+    tree = LexborHTMLParser(html)
     headlines = []
-    detection_time = datetime.now()
     # Selectors for CNBC vary a lot
-    articles = soup.select('div.Card-standardBreakerCard, div.Card-titleContainer, li.LatestNews-item, div[class*="RiverCard-container"]')
+    articles = tree.css(CNBC_ARTICLE_SELECTOR)
     for article in articles:
-        headline_tag = article.select_one('a[href]') # More generic link selector
+        headline_tag = article.css_first(CNBC_LINK_SELECTOR)
         if headline_tag:
-             title_tag = article.select_one('.Card-title, .LatestNews-headline, [class*="RiverHeadline-headline"]') # Find title specifically
-             headline = ' '.join(title_tag.text.split()) if title_tag else ' '.join(headline_tag.text.split())
-             link = headline_tag.get('href')
+             title_tag = article.css_first(CNBC_TITLE_SELECTOR) # Find title specifically
+             headline = ' '.join(title_tag.text().split()) if title_tag else ' '.join(headline_tag.text().split())
+             link = headline_tag.attributes.get('href')
              absolute_link = urljoin(base_url, link) if link else url
              if headline and absolute_link:
                  headlines.append((headline, absolute_link, detection_time))
@@ -88,23 +110,18 @@ async def scrape_cnbc(session: aiohttp.ClientSession, config: Dict[str, Any]) ->
     return headlines
 
 
-async def scrape_yahoo_finance(session: aiohttp.ClientSession, config: Dict[str, Any]) -> List[Tuple[str, str, datetime]]:
-    """Scrapes headlines from Yahoo Finance."""
-    url = config['url']
-    base_url = config['base_url']
-    html = await fetch_html(session, url)
-    if not html: return []
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_yahoo_finance(html: str, url: str, base_url: str, detection_time: datetime) -> List[Tuple[str, str, datetime]]:
+    """Extracts headlines from Yahoo Finance HTML."""
+    tree = LexborHTMLParser(html)
     headlines = []
-    detection_time = datetime.now()
     # Yahoo's structure is often complex and JS-reliant
-    articles = soup.select('li.js-stream-content h3 a[href]') # Select links directly
+    articles = tree.css(YAHOO_LINK_SELECTOR)
     if not articles: # Fallback selector
-         articles = soup.select('div[class*="stream-item"] a[href]')
+         articles = tree.css(YAHOO_FALLBACK_LINK_SELECTOR)
 
     for headline_tag in articles:
-        headline = ' '.join(headline_tag.text.split())
-        link = headline_tag.get('href')
+        headline = ' '.join(headline_tag.text().split())
+        link = headline_tag.attributes.get('href')
         # Yahoo links are often absolute but sometimes relative
         if link and link.startswith('/'):
             absolute_link = urljoin(base_url, link)
@@ -120,23 +137,18 @@ async def scrape_yahoo_finance(session: aiohttp.ClientSession, config: Dict[str,
     return headlines
 
 
-async def scrape_finviz(session: aiohttp.ClientSession, config: Dict[str, Any]) -> List[Tuple[str, str, datetime]]:
-    """Scrapes headlines from Finviz News page."""
-    url = config['url']
-    base_url = config['base_url']
-    html = await fetch_html(session, url)
-    if not html: return []
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_finviz(html: str, url: str, base_url: str, detection_time: datetime) -> List[Tuple[str, str, datetime]]:
+    """Extracts headlines from Finviz News page HTML."""
+    tree = LexborHTMLParser(html)
     headlines = []
-    detection_time = datetime.now()
-    news_table = soup.select_one('table.news-table')
+    news_table = tree.css_first(FINVIZ_TABLE_SELECTOR)
     if news_table:
-        rows = news_table.find_all('tr')
+        rows = news_table.css(FINVIZ_ROW_SELECTOR)
         for row in rows:
-            headline_tag = row.select_one('td a.nn-tab-link, td a.tab-link-news')
-            if headline_tag and headline_tag.text:
-                headline = ' '.join(headline_tag.text.split())
-                link = headline_tag.get('href')
+            headline_tag = row.css_first(FINVIZ_LINK_SELECTOR)
+            if headline_tag and headline_tag.text():
+                headline = ' '.join(headline_tag.text().split())
+                link = headline_tag.attributes.get('href')
                 absolute_link = urljoin(base_url, link) if link else url
                 if headline and absolute_link:
                     headlines.append((headline, absolute_link, detection_time))
@@ -145,20 +157,15 @@ async def scrape_finviz(session: aiohttp.ClientSession, config: Dict[str, Any])
     return headlines
 
 
-async def scrape_seeking_alpha(session: aiohttp.ClientSession, config: Dict[str, Any]) -> List[Tuple[str, str, datetime]]:
-    """Scrapes headlines from Seeking Alpha Market News."""
-    url = config['url']
-    base_url = config['base_url']
-    html = await fetch_html(session, url)
-    if not html: return []
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_seeking_alpha(html: str, url: str, base_url: str, detection_time: datetime) -> List[Tuple[str, str, datetime]]:
+    """Extracts headlines from Seeking Alpha Market News HTML."""
+    tree = LexborHTMLParser(html)
     headlines = []
-    detection_time = datetime.now()
     # Seeking Alpha often uses data attributes
-    articles = soup.select('article[data-test-id="post-list-item"] a[data-test-id="post-list-item-title"], div[class*="media-body"] a[href]')
+    articles = tree.css(SEEKING_ALPHA_LINK_SELECTOR)
     for headline_tag in articles:
-        headline = ' '.join(headline_tag.text.split())
-        link = headline_tag.get('href')
+        headline = ' '.join(headline_tag.text().split())
+        link = headline_tag.attributes.get('href')
         absolute_link = urljoin(base_url, link) if link else url
         if headline and absolute_link:
             headlines.append((headline, absolute_link, detection_time))
@@ -167,6 +174,48 @@ async def scrape_seeking_alpha(session: aiohttp.ClientSession, config: Dict[str,
     return headlines
 
 
+# --- Source Scrapers (fetch on the event loop, parse on parse_executor) ---
+async def _fetch_and_parse(session: aiohttp.ClientSession, config: Dict[str, Any], parser, now: datetime) -> List[Tuple[str, str, datetime]]:
+    """
+    Fetches a source page, then runs its parser in a worker thread so HTML parsing doesn't block the event loop.
+    Headlines are stamped with `now` (the scrape cycle's UTC time).
+    """
+    url = config['url']
+    html, status = await fetch_html(session, url)
+    if status == 304 and url in conditional_cache:
+        # Page unchanged: skip parsing, replay last headlines re-stamped with this cycle's time
+        return [(title, link, now) for title, link, _ in conditional_cache[url][2]]
+    if not html: return []
+    loop = asyncio.get_running_loop()
+    headlines = await loop.run_in_executor(parse_executor, parser, html, url, config['base_url'], now)
+    etag, last_modified, _ = conditional_cache.get(url, (None, None, None))
+    if headlines and (etag or last_modified):
+        conditional_cache[url] = (etag, last_modified, headlines)
+    else:
+        conditional_cache.pop(url, None) # Nothing to replay; fetch unconditionally next time
+    return headlines
+
+async def scrape_marketwatch(session: aiohttp.ClientSession, config: Dict[str, Any], now: datetime) -> List[Tuple[str, str, datetime]]:
+    """Scrapes headlines from MarketWatch."""
+    return await _fetch_and_parse(session, config, parse_marketwatch, now)
+
+async def scrape_cnbc(session: aiohttp.ClientSession, config: Dict[str, Any], now: datetime) -> List[Tuple[str, str, datetime]]:
+    """Scrapes headlines from CNBC."""
+    return await _fetch_and_parse(session, config, parse_cnbc, now)
+
+async def scrape_yahoo_finance(session: aiohttp.ClientSession, config: Dict[str, Any], now: datetime) -> List[Tuple[str, str, datetime]]:
+    """Scrapes headlines from Yahoo Finance."""
+    return await _fetch_and_parse(session, config, parse_yahoo_finance, now)
+
+async def scrape_finviz(session: aiohttp.ClientSession, config: Dict[str, Any], now: datetime) -> List[Tuple[str, str, datetime]]:
+    """Scrapes headlines from Finviz News page."""
+    return await _fetch_and_parse(session, config, parse_finviz, now)
+
+async def scrape_seeking_alpha(session: aiohttp.ClientSession, config: Dict[str, Any], now: datetime) -> List[Tuple[str, str, datetime]]:
+    """Scrapes headlines from Seeking Alpha Market News."""
+    return await _fetch_and_parse(session, config, parse_seeking_alpha, now)
+
+
 # --- Main Scraper Function ---
 SCRAPER_FUNCTIONS = {
     "MarketWatch": scrape_marketwatch,
@@ -176,35 +225,66 @@ SCRAPER_FUNCTIONS = {
     "Seeking Alpha": scrape_seeking_alpha,
 }
 
-async def scrape_all(sources_config: Dict[str, Dict[str, Any]]) -> Dict[str, List[Tuple[str, str, datetime]]]:
-    """Scrapes all configured sources concurrently."""
+# Dedicated pool for HTML parsing, so pages parse in parallel off the event loop
+parse_executor = ThreadPoolExecutor(max_workers=min(8, len(SCRAPER_FUNCTIONS)), thread_name_prefix="parse")
+
+# --- Shared HTTP Session ---
+# One session for the bot's lifetime, so keep-alive connections, TLS sessions and
+# the DNS cache survive between scrape cycles. Created lazily on the running loop.
+http_session: aiohttp.ClientSession | None = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """Returns the shared aiohttp session, creating it on first use (or after it was closed)."""
+    global http_session
+    if http_session is None or http_session.closed:
+        # Limited connections to avoid overwhelming sites or hitting local limits
+        # Event-loop-native DNS via aiodns (c-ares) instead of getaddrinfo in the default thread pool
+        connector = aiohttp.TCPConnector(resolver=AsyncResolver(), limit=20, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=75) # Adjust limits as needed
+        http_session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=20))
+    return http_session
+
+async def scrape_all(sources_config: Dict[str, Dict[str, Any]], max_concurrency: int = 10) -> Dict[str, List[Tuple[str, str, datetime]]]:
+    """Scrapes all configured sources concurrently, at most `max_concurrency` at a time."""
     results = {}
-    # Create connector with limited connections to avoid overwhelming sites or hitting local limits
-    connector = aiohttp.TCPConnector(limit_per_host=2, limit=10, ssl=False) # Adjust limits as needed
-    async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = []
-        source_names = []
-        for name, config_data in sources_config.items():
-            if name in SCRAPER_FUNCTIONS:
-                tasks.append(asyncio.create_task(SCRAPER_FUNCTIONS[name](session, config_data)))
-                source_names.append(name)
-            else:
-                logger.warning(f"No scraper function defined for source: {name}")
+    session = await get_session()
+    now = datetime.now(timezone.utc) # One detection time (aware UTC) for every headline of this cycle
+    semaphore = asyncio.Semaphore(max_concurrency) # Keeps large source lists from exhausting sockets/FDs
 
-        scraped_data_list = await asyncio.gather(*tasks, return_exceptions=True)
+    async def guarded(scrape_func, config_data):
+        async with semaphore:
+            return await scrape_func(session, config_data, now)
 
-        for i, data in enumerate(scraped_data_list):
-            source_name = source_names[i]
-            if isinstance(data, Exception):
-                logger.error(f"Error scraping {source_name}: {data}", exc_info=False) # Keep log concise
-                results[source_name] = []
-            elif data is not None:
-                results[source_name] = data
-            else:
-                results[source_name] = []
+    tasks = []
+    source_names = []
+    for name, config_data in sources_config.items():
+        if name in SCRAPER_FUNCTIONS:
+            tasks.append(asyncio.create_task(guarded(SCRAPER_FUNCTIONS[name], config_data)))
+            source_names.append(name)
+        else:
+            logger.warning(f"No scraper function defined for source: {name}")
+
+    scraped_data_list = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for i, data in enumerate(scraped_data_list):
+        source_name = source_names[i]
+        if isinstance(data, Exception):
+            logger.error(f"Error scraping {source_name}: {data}", exc_info=False) # Keep log concise
+            results[source_name] = []
+        elif data is not None:
+            results[source_name] = data
+        else:
+            results[source_name] = []
 
     return results
 
+async def close():
+    """Closes the shared HTTP session and shuts down the parsing thread pool. Called when the bot shuts down."""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+    parse_executor.shutdown(wait=False, cancel_futures=True)
+
 # Example Usage (for testing scraper.py directly)
 if __name__ == "__main__":
     import config as app_config
@@ -212,7 +292,7 @@ if __name__ == "__main__":
 
     async def test_scrape():
         print("Testing scrapers...")
-        all_headlines = await scrape_all(app_config.NEWS_SOURCES)
+        all_headlines = await scrape_all(app_config.NEWS_SOURCES, app_config.MAX_CONCURRENT_SCRAPES)
         print("\n--- Results ---")
         for source, headlines in all_headlines.items():
             print(f"\n{source} ({len(headlines)} found):")
@@ -221,6 +301,7 @@ if __name__ == "__main__":
                     print(f"  - [{time.strftime('%H:%M:%S')}] {title} ({link})")
             else:
                 print("  - No headlines found or error occurred.")
+        await close()
 
     try:
         asyncio.run(test_scrape())
@@ -0,0 +1,49 @@
+import sqlite3
+import logging
+import time
+import config
+
+logger = logging.getLogger(__name__)
+
+# --- SQLite Persistence for Seen Headlines ---
+# Keeps deduplication history across restarts (otherwise every restart re-evaluates, re-translates
+# and re-posts the current front pages). main_bot keeps its in-memory OrderedDicts as a read-through cache.
+# Autocommit (isolation_level=None) + WAL: each write is its own small transaction and doesn't block readers.
+connection = sqlite3.connect(config.SEEN_DB_PATH, isolation_level=None)
+connection.execute("PRAGMA journal_mode=WAL")
+connection.execute("PRAGMA synchronous=NORMAL") # Safe with WAL; at worst the last few writes are lost on power failure
+connection.execute("CREATE TABLE IF NOT EXISTS seen (uid TEXT PRIMARY KEY, norm_title TEXT, ts INTEGER NOT NULL) WITHOUT ROWID")
+connection.execute("CREATE INDEX IF NOT EXISTS seen_ts ON seen (ts)") # For recency loads and pruning
+logger.info(f"Seen-headline store opened: {config.SEEN_DB_PATH}")
+
+def has_seen(unique_id: str) -> bool:
+    """Returns True if this unique_id (source:url) has been recorded."""
+    return connection.execute("SELECT 1 FROM seen WHERE uid = ?", (unique_id,)).fetchone() is not None
+
+def mark_seen(unique_id: str, normalized_title: str | None = None):
+    """Records a unique_id (and its normalized title, if known), refreshing its timestamp if already present."""
+    connection.execute(
+        "INSERT INTO seen (uid, norm_title, ts) VALUES (?, ?, ?) "
+        "ON CONFLICT (uid) DO UPDATE SET norm_title = COALESCE(excluded.norm_title, norm_title), ts = excluded.ts",
+        (unique_id, normalized_title or None, int(time.time()))
+    )
+
+def recent_ids(limit: int) -> list[str]:
+    """Returns up to `limit` most recently recorded unique_ids, oldest first."""
+    rows = connection.execute("SELECT uid FROM seen ORDER BY ts DESC LIMIT ?", (limit,)).fetchall()
+    return [uid for uid, in reversed(rows)]
+
+def recent_titles(limit: int) -> list[str]:
+    """Returns up to `limit` most recently recorded distinct normalized titles, oldest first."""
+    rows = connection.execute(
+        "SELECT norm_title FROM seen WHERE norm_title IS NOT NULL GROUP BY norm_title ORDER BY MAX(ts) DESC LIMIT ?", (limit,)
+    ).fetchall()
+    return [title for title, in reversed(rows)]
+
+def prune(max_age_seconds: int) -> int:
+    """Deletes entries older than max_age_seconds. Returns the number of rows removed."""
+    return connection.execute("DELETE FROM seen WHERE ts < ?", (int(time.time()) - max_age_seconds,)).rowcount
+
+def close():
+    """Closes the database (checkpointing the WAL). Called when the bot shuts down."""
+    connection.close()